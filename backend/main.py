@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import asyncio
 import random
 import glob
 import os
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from functools import lru_cache
 from datetime import datetime, timezone
 from typing import Dict, List, Optional
 import time
@@ -11,7 +16,7 @@ from typing import Any, Dict, List
 
 from fastapi import FastAPI, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 
 
 
@@ -37,6 +42,17 @@ FIRES_CACHE: Dict[str, Any] = {
 }
 
 CACHE_TTL_SECONDS = 300  # 5 minutes
+BUNDLE_MAX_AGE_SECONDS = 60  # browser cache for /api/fires/{id}/bundle
+
+# Raster products served per fire: bundle key -> (route name, file suffixes in preference order)
+RASTER_PRODUCTS: Dict[str, Dict[str, Any]] = {
+  "burnSeverity": {"route": "get_burn_severity_raster", "suffixes": ["_dnbr6.tif"]},
+  "reburnRisk": {"route": "get_reburn_risk_raster", "suffixes": ["_reburn_risk.tif"]},
+  "bestNextSteps": {
+    "route": "get_best_next_steps_raster",
+    "suffixes": ["_best_next_steps_grid.tif", "_best_next_steps.tif"],
+  },
+}
 
 FIRE_CATALOG: List[Dict] = [
   {
@@ -364,6 +380,80 @@ def _refresh_fires_cache(force: bool = False) -> None:
   FIRES_CACHE["last_refresh"] = now
 
 
+def find_mtbs_file(mtbs_event_id: str, suffixes: List[str]) -> Optional[str]:
+  """Return the first file under CA_data/{mtbs_event_id} matching one of the suffixes."""
+  ca_data_dir = os.path.join(DATA_ROOT, mtbs_event_id)
+  for suffix in suffixes:
+    matching_files = glob.glob(os.path.join(ca_data_dir, f"{mtbs_event_id}_*{suffix}"))
+    if matching_files:
+      return matching_files[0]
+  return None
+
+
+def resolve_raster_products(fire: Dict) -> Dict[str, Dict]:
+  """Availability and download URL of each raster product for a fire."""
+  mtbs_event_id = fire.get("mtbs_event_id")
+  products = {}
+  for key, product in RASTER_PRODUCTS.items():
+    available = bool(mtbs_event_id) and find_mtbs_file(mtbs_event_id, product["suffixes"]) is not None
+    products[key] = {
+      "available": available,
+      "url": app.url_path_for(product["route"], fire_id=fire["id"]) if available else None,
+    }
+  return products
+
+
+def _kml_namespace(root: ET.Element) -> Dict[str, str]:
+  # MTBS has shipped KML 2.1 and 2.2 (Google and OGC URIs); use whatever the document declares
+  match = re.match(r"\{(.*)\}", root.tag)
+  return {"kml": match.group(1) if match else ""}
+
+
+@lru_cache(maxsize=32)
+def load_mtbs_kmz(mtbs_event_id: Optional[str]) -> Dict[str, Any]:
+  """
+  Reads bounds and perimeter from the MTBS KMZ that ships with each event.
+  The KML is already in WGS84, so no reprojection is needed. Cached since CA_data is static.
+  An unreadable or malformed KMZ yields empty bounds/perimeter rather than an error.
+  """
+  empty: Dict[str, Any] = {"bounds": None, "perimeter": None}
+  kmz_path = find_mtbs_file(mtbs_event_id, [".kmz"]) if mtbs_event_id else None
+  if not kmz_path:
+    return empty
+
+  try:
+    with zipfile.ZipFile(kmz_path) as kmz:
+      kml_name = next((n for n in kmz.namelist() if n.lower().endswith(".kml")), None)
+      if not kml_name:
+        return empty
+      root = ET.fromstring(kmz.read(kml_name))
+    ns = _kml_namespace(root)
+
+    bounds = None
+    box = root.find(".//kml:LatLonBox", ns)
+    if box is not None:
+      edges = {edge: float(box.findtext(f"kml:{edge}", default="", namespaces=ns)) for edge in ("north", "south", "east", "west")}
+      # Leaflet order: [[south, west], [north, east]]
+      bounds = [
+        [round(edges["south"], 5), round(edges["west"], 5)],
+        [round(edges["north"], 5), round(edges["east"], 5)],
+      ]
+
+    rings = []
+    for coords in root.iterfind(".//kml:Placemark//kml:outerBoundaryIs//kml:coordinates", ns):
+      ring = []
+      for point in (coords.text or "").split():
+        lng, lat = point.split(",")[:2]
+        ring.append([round(float(lat), 5), round(float(lng), 5)])
+      if ring:
+        rings.append(ring)
+  except (OSError, zipfile.BadZipFile, ET.ParseError, ValueError):
+    # Bounds/perimeter are optional extras; never let them take down the bundle
+    return empty
+
+  return {"bounds": bounds, "perimeter": rings or None}
+
+
 @app.get("/api/fires")
 async def list_fires(
   state: Optional[str] = Query(None, description="Filter by state code (e.g., CA, OR)"),
@@ -421,12 +511,22 @@ async def get_scenario(
   priorityInfrastructure: int = Query(60, ge=0, le=100),
 ):
   fire = pick_fire(fireId)
+  return build_scenario(fire, timeline, priorityCommunity, priorityWatershed, priorityInfrastructure)
+
+
+def build_scenario(
+  fire: Dict,
+  timeline: int,
+  priority_community: int,
+  priority_watershed: int,
+  priority_infrastructure: int,
+) -> Dict:
   timeline_meta = get_timeline_meta(timeline)
 
   raw_priorities = {
-    "community": parse_priority(priorityCommunity, 70),
-    "watershed": parse_priority(priorityWatershed, 55),
-    "infrastructure": parse_priority(priorityInfrastructure, 60),
+    "community": parse_priority(priority_community, 70),
+    "watershed": parse_priority(priority_watershed, 55),
+    "infrastructure": parse_priority(priority_infrastructure, 60),
   }
   normalized_priorities = normalize_priorities(raw_priorities)
 
@@ -528,17 +628,14 @@ async def get_burn_severity_raster(fire_id: str):
     )
   
   # Look for dnbr6.tif file (pattern: {event_id}_*_dnbr6.tif)
-  pattern = os.path.join(ca_data_dir, f"{mtbs_event_id}_*_dnbr6.tif")
-  matching_files = glob.glob(pattern)
+  file_path = find_mtbs_file(mtbs_event_id, RASTER_PRODUCTS["burnSeverity"]["suffixes"])
   
-  if not matching_files:
+  if not file_path:
     raise HTTPException(
       status_code=404,
       detail=f"MTBS burn severity raster (dnbr6.tif) not found for fire: {fire_id}"
     )
   
-  file_path = matching_files[0]  # Use first match
-  
   return FileResponse(
     file_path,
     media_type="image/tiff",
@@ -574,17 +671,14 @@ async def get_reburn_risk_raster(fire_id: str):
     )
   
   # Look for reburn_risk.tif file (pattern: {event_id}_*_reburn_risk.tif)
-  pattern = os.path.join(ca_data_dir, f"{mtbs_event_id}_*_reburn_risk.tif")
-  matching_files = glob.glob(pattern)
+  file_path = find_mtbs_file(mtbs_event_id, RASTER_PRODUCTS["reburnRisk"]["suffixes"])
   
-  if not matching_files:
+  if not file_path:
     raise HTTPException(
       status_code=404,
       detail=f"Reburn risk raster not found for fire: {fire_id}"
     )
   
-  file_path = matching_files[0]  # Use first match
-  
   return FileResponse(
     file_path,
     media_type="image/tiff",
@@ -619,23 +713,15 @@ async def get_best_next_steps_raster(fire_id: str):
       detail=f"MTBS data directory not found: {ca_data_dir}"
     )
   
-  # Look for best_next_steps_grid.tif file (prefer grid version)
-  pattern_grid = os.path.join(ca_data_dir, f"{mtbs_event_id}_*_best_next_steps_grid.tif")
-  matching_files = glob.glob(pattern_grid)
-  
-  # Fallback to non-grid version if grid doesn't exist
-  if not matching_files:
-    pattern = os.path.join(ca_data_dir, f"{mtbs_event_id}_*_best_next_steps.tif")
-    matching_files = glob.glob(pattern)
+  # Look for best_next_steps_grid.tif file (prefer grid version, fall back to non-grid)
+  file_path = find_mtbs_file(mtbs_event_id, RASTER_PRODUCTS["bestNextSteps"]["suffixes"])
   
-  if not matching_files:
+  if not file_path:
     raise HTTPException(
       status_code=404,
       detail=f"Best next steps raster not found for fire: {fire_id}"
     )
   
-  file_path = matching_files[0]  # Use first match
-  
   return FileResponse(
     file_path,
     media_type="image/tiff",
@@ -646,6 +732,42 @@ async def get_best_next_steps_raster(fire_id: str):
   )
 
 
+@app.get("/api/fires/{fire_id}/bundle")
+async def get_fire_bundle(
+  fire_id: str,
+  timeline: int = Query(2, ge=0, le=4),
+  priorityCommunity: int = Query(70, ge=0, le=100),
+  priorityWatershed: int = Query(55, ge=0, le=100),
+  priorityInfrastructure: int = Query(60, ge=0, le=100),
+  include: List[str] = Query([], description="Optional extras, e.g. include=perimeter"),
+):
+  """
+  Everything the map needs to open a fire in one round trip: scenario, raster
+  product availability and URLs, and bounds. Disk lookups run concurrently in
+  worker threads. The perimeter ring is only sent on ?include=perimeter.
+  """
+  fire = pick_fire(fire_id)
+
+  products_task = asyncio.to_thread(resolve_raster_products, fire)
+  mtbs_task = asyncio.to_thread(load_mtbs_kmz, fire.get("mtbs_event_id"))
+  scenario_task = asyncio.to_thread(
+    build_scenario, fire, timeline, priorityCommunity, priorityWatershed, priorityInfrastructure
+  )
+  products, mtbs, scenario = await asyncio.gather(products_task, mtbs_task, scenario_task)
+
+  bundle = {
+    "fireId": fire["id"],
+    "scenario": scenario,
+    "products": products,
+    "bounds": mtbs["bounds"],
+    "generatedAt": scenario["generatedAt"],
+  }
+  if "perimeter" in include:
+    bundle["perimeter"] = mtbs["perimeter"]
+
+  return JSONResponse(bundle, headers={"Cache-Control": f"private, max-age={BUNDLE_MAX_AGE_SECONDS}"})
+
+
 @app.get("/api/health")
 async def health_check():
   return {"status": "ok", "timestamp": datetime.now(timezone.utc).isoformat()}
@@ -76,6 +76,22 @@ const state = {
   selectedSuggestionIndex: -1,
   selectedState: null,
   selectedYear: null,
+  // Last fire bundle: { fireId, products, bounds }; only trusted while fireId matches
+  bundle: null,
+};
+
+// Raster downloads per layer; the fire bundle tells us which exist before we fetch
+const RASTER_ROUTES = {
+  burnSeverity: 'burn-severity',
+  reburnRisk: 'reburn-risk',
+  bestNextSteps: 'best-next-steps',
+};
+
+const fetchRaster = async (key, fireId) => {
+  const product = state.bundle?.fireId === fireId ? state.bundle.products?.[key] : null;
+  if (product && !product.available) return null;
+  const path = product?.url || `/api/${RASTER_ROUTES[key]}/${fireId}.tif`;
+  return fetch(`${API_BASE_URL}${path}`);
 };
 
 // Initialize year dropdown (derived from loaded fire catalog when available)
@@ -354,10 +370,10 @@ const renderBurnSeverityRaster = async (fireId) => {
   try {
     console.log('Loading MTBS burn severity raster for fire:', fireId);
     // Load GeoTIFF from backend
-    const response = await fetch(`${API_BASE_URL}/api/burn-severity/${fireId}.tif`);
+    const response = await fetchRaster('burnSeverity', fireId);
     
-    if (!response.ok) {
-      console.warn('MTBS raster not available (status:', response.status, '), using fallback circles');
+    if (!response || !response.ok) {
+      console.warn('MTBS raster not available (status:', response?.status, '), using fallback circles');
       return; // Will fall back to circles
     }
     
@@ -511,10 +527,10 @@ const renderReburnRiskRaster = async (fireId) => {
   try {
     console.log('Loading reburn risk raster for fire:', fireId);
     // Load GeoTIFF from backend
-    const response = await fetch(`${API_BASE_URL}/api/reburn-risk/${fireId}.tif`);
+    const response = await fetchRaster('reburnRisk', fireId);
     
-    if (!response.ok) {
-      console.warn('Reburn risk raster not available (status:', response.status, '), using fallback circles');
+    if (!response || !response.ok) {
+      console.warn('Reburn risk raster not available (status:', response?.status, '), using fallback circles');
       return; // Will fall back to circles
     }
     
@@ -666,10 +682,10 @@ const renderBestNextStepsRaster = async (fireId) => {
   try {
     console.log('Loading best next steps raster for fire:', fireId);
     // Load GeoTIFF from backend
-    const response = await fetch(`${API_BASE_URL}/api/best-next-steps/${fireId}.tif`);
+    const response = await fetchRaster('bestNextSteps', fireId);
     
-    if (!response.ok) {
-      console.warn('Best next steps raster not available (status:', response.status, '), using fallback circles');
+    if (!response || !response.ok) {
+      console.warn('Best next steps raster not available (status:', response?.status, '), using fallback circles');
       return; // Will fall back to circles
     }
     
@@ -1188,6 +1204,27 @@ const fetchScenario = async () => {
   }
 };
 
+// One round trip for scenario, raster availability and bounds when a fire is opened
+const fetchFireBundle = async () => {
+  const params = new URLSearchParams({
+    timeline: state.timeline,
+    priorityCommunity: state.priorities.community,
+    priorityWatershed: state.priorities.watershed,
+    priorityInfrastructure: state.priorities.infrastructure,
+  });
+
+  try {
+    const response = await fetch(
+      `${API_BASE_URL}/api/fires/${encodeURIComponent(state.fireId)}/bundle?${params.toString()}`
+    );
+    if (!response.ok) throw new Error('Bundle request failed');
+    return await response.json();
+  } catch (error) {
+    console.warn('Bundle unavailable, falling back to scenario endpoint', error);
+    return null;
+  }
+};
+
 const renderScenario = async (scenario) => {
   if (!scenario) return;
   await renderLayers(scenario.layers);
@@ -1198,7 +1235,10 @@ const renderScenario = async (scenario) => {
   updateStats(scenario.stats);
   updateMapTip(scenario.mapTip);
   updateHeader(scenario.fire, scenario.timeline);
-  if (scenario.fire?.center) {
+  const fireBounds = state.bundle?.fireId === state.fireId ? state.bundle.bounds : null;
+  if (fireBounds) {
+    map.flyToBounds(fireBounds, { duration: 1, maxZoom: 12 });
+  } else if (scenario.fire?.center) {
     map.flyTo(scenario.fire.center, 9, { duration: 1 });
   } else if (scenario.fire?.lat && scenario.fire?.lng) {
     map.flyTo([scenario.fire.lat, scenario.fire.lng], 9, { duration: 1 });
@@ -1216,7 +1256,17 @@ const renderScenario = async (scenario) => {
 const loadScenario = async () => {
   updateForecastLabels();
   setPriorityDisplays();
-  const scenario = await fetchScenario();
+  // Slider changes only need the scenario; the bundle is fetched once per fire
+  let scenario = null;
+  if (state.bundle?.fireId !== state.fireId) {
+    const fireId = state.fireId;
+    const bundle = await fetchFireBundle();
+    if (bundle && fireId === state.fireId) {
+      state.bundle = { fireId, products: bundle.products, bounds: bundle.bounds };
+      scenario = bundle.scenario;
+    }
+  }
+  if (!scenario) scenario = await fetchScenario();
   await renderScenario(scenario);
 };
 